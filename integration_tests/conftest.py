@@ -0,0 +1,19 @@
+"""Shared fixtures for the integration test suite."""
+
+import os
+import sys
+
+import pytest
+
+# Add project root to path so the backend app is importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.app import app
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the Flask app"""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
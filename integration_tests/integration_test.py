@@ -1,30 +1,13 @@
 """
-Integration tests for US-TEST-INT1
-Contains the fetch→parse→convert end-to-end integration tests.
+Integration tests for US-TEST-INT1: fetch→parse→convert flow
+Tests how multiple components interact together
 Author: Ishanvee
 Jira: US-TEST-INT1, SCRUM-14
 """
 
-import pytest
-import sys
-import os
-
-# Add parent directory to path to import app
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-from app import app
-
-
-@pytest.fixture
-def client():
-    """Create a test client for the Flask app"""
-    app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
-
 
 # ============================================
-# INTEGRATION TESTS: END-TO-END FLOWS (PART 1)
+# INTEGRATION TESTS: END-TO-END FLOWS
 # ============================================
 
 def test_complete_url_to_pdf_flow(client):
@@ -43,10 +26,10 @@ def test_complete_url_to_pdf_flow(client):
                           content_type='application/json')
 
     # Verify complete flow succeeded
+    body = response.data
     assert response.status_code == 200, "Complete URL→PDF flow should succeed"
     assert 'pdf' in response.content_type.lower(), "Should return PDF content type"
-    assert len(response.data) > 0, "PDF should have content"
-    assert response.data[:4] == b'%PDF', "Should be valid PDF signature"
+    assert body.startswith(b'%PDF'), "Should be valid PDF signature"
 
 
 def test_frontend_backend_api_integration(client):
@@ -71,7 +54,7 @@ def test_frontend_backend_api_integration(client):
         # Check response headers match frontend expectations
         content_disp = response.headers.get('Content-Disposition', '')
         assert 'attachment' in content_disp, "Should trigger browser download"
-        assert 'blog.pdf' in content_disp, "Should have correct filename"
+        assert content_disp.find('blog.pdf') >= 0, "Should have correct filename"
 
 
 def test_url_fetch_pdf_convert_integration(client):
@@ -94,8 +77,9 @@ def test_url_fetch_pdf_convert_integration(client):
 
         # Verify fetching and conversion work together
         if response.status_code == 200:
-            assert len(response.data) > 100, f"PDF for {url} should have substantial content"
-            assert response.data[:4] == b'%PDF', f"PDF for {url} should be valid"
+            body = response.data
+            assert len(body) > 100, f"PDF for {url} should have substantial content"
+            assert body.startswith(b'%PDF'), f"PDF for {url} should be valid"
 
 
 def test_error_handling_integration(client):
@@ -113,7 +97,6 @@ def test_error_handling_integration(client):
                           json={'url': 'https://completely-invalid-domain-xyz123.com'})
 
     # Verify error handling integration
-    # in test_integration1.py
     assert response.status_code == 500, "Network errors should return 500"
     json_data = response.get_json()
     assert 'error' in json_data, "Error should propagate to JSON response"
@@ -141,8 +124,9 @@ def test_temporary_file_handling_integration(client):
 
     if response.status_code == 200:
         # Verify file was created, written to, and served correctly
-        assert response.data is not None, "Temp file should be served"
-        assert len(response.data) > 0, "Temp file should have content"
+        body = response.data
+        assert body is not None, "Temp file should be served"
+        assert len(body) > 0, "Temp file should have content"
 
 
 def test_pdf_options_integration(client):
@@ -160,3 +144,100 @@ def test_pdf_options_integration(client):
     # Options should allow conversion even if some resources fail
     if response.status_code == 200:
         assert len(response.data) > 0, "PDF generated despite potential resource errors"
+
+
+# ============================================
+# INTEGRATION TESTS: COMPLEX SCENARIOS
+# ============================================
+
+def test_large_page_integration(client):
+    """Integration Test: System handles larger web pages
+
+    Tests complete flow with substantial content:
+    1. Fetch larger page
+    2. Process more HTML
+    3. Generate larger PDF
+
+    Maps to SRS: F-002 (Support blog platforms), F-009 (Parse HTML)
+    """
+    # Test with a longer page (Wikipedia article)
+    response = client.post('/convert',
+                          json={'url': 'https://en.wikipedia.org/wiki/Python_(programming_language)'})
+
+    # May succeed or fail, but should handle gracefully
+    assert response.status_code in [200, 500], "Should handle large pages"
+
+    if response.status_code == 200:
+        # PDF should be larger for bigger pages
+        assert len(response.data) > 10000, "Large page should produce substantial PDF"
+
+
+def test_different_blog_platforms_integration(client):
+    """Integration Test: System works with different website types
+
+    Tests fetch→parse→convert flow across different HTML structures
+
+    Maps to SRS: F-002 (Support major blog platforms)
+    """
+    # Test different website structures
+    test_sites = [
+        'https://example.com',  # Simple HTML
+        'https://example.org',  # Different structure
+    ]
+
+    success_count = 0
+    for site in test_sites:
+        response = client.post('/convert', json={'url': site})
+        if response.status_code == 200:
+            success_count += 1
+
+    # At least one should succeed
+    assert success_count > 0, "Should handle at least one site successfully"
+
+
+def test_response_headers_integration(client):
+    """Integration Test: All required headers present in response
+
+    Verifies headers are set correctly through the entire stack:
+    - Flask sets Content-Type
+    - send_file sets Content-Disposition
+    - Headers propagate to client correctly
+
+    Maps to SRS: F-013 (Download PDF)
+    """
+    response = client.post('/convert',
+                          json={'url': 'https://example.com'})
+
+    if response.status_code == 200:
+        # Verify headers are set correctly
+        assert 'Content-Type' in response.headers, "Should have Content-Type header"
+        assert 'Content-Disposition' in response.headers, "Should have Content-Disposition header"
+        content_disp = response.headers['Content-Disposition']
+        assert content_disp.find('blog.pdf') >= 0, "Should specify filename"
+        assert 'attachment' in content_disp, "Should trigger download"
+
+
+def test_json_error_response_integration(client):
+    """Integration Test: Error responses maintain JSON format
+
+    Tests that all error paths return consistent JSON:
+    - Missing URL → JSON error
+    - Invalid URL → JSON error
+    - Network error → JSON error
+
+    Maps to SRS: NF-004 (Meaningful error messages)
+    """
+    error_scenarios = [
+        ({}, 400),  # Missing URL
+        ({'url': ''}, 400),  # Empty URL
+        ({'url': 'invalid-url'}, 400),  # Invalid format rejected early
+    ]
+
+    for payload, expected_status in error_scenarios:
+        response = client.post('/convert', json=payload)
+
+        assert response.status_code == expected_status, f"Should return {expected_status}"
+        json_data = response.get_json()
+        assert json_data is not None, "Should return JSON"
+        assert 'error' in json_data, "Should have error field"
+        assert isinstance(json_data['error'], str), "Error should be string"
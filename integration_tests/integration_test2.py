@@ -1,277 +0,0 @@
-
-"""
-Integration tests for US-TEST-INT1: fetch→parse→convert flow
-Tests how multiple components interact together
-Author: Ishanvee
-Jira: US-TEST-INT1, SCRUM-14
-"""
-
-import pytest
-import sys
-import os
-
-# Add parent directory to path to import app
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-from app import app
-
-
-@pytest.fixture
-def client():
-    """Create a test client for the Flask app"""
-    app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
-
-
-# ============================================
-# INTEGRATION TESTS: END-TO-END FLOWS
-# ============================================
-
-def test_complete_url_to_pdf_flow(client):
-    """Integration Test: Complete flow from URL input to PDF output
-    
-    Tests integration of:
-    - Request handling (Flask)
-    - URL fetching (pdfkit.from_url)
-    - PDF conversion (wkhtmltopdf)
-    - File serving (Flask send_file)
-    
-    Maps to SRS: F-004 (Fetch), F-006 (Convert), F-013 (Download)
-    """
-    response = client.post('/convert',
-                          json={'url': 'https://example.com'},
-                          content_type='application/json')
-    
-    # Verify complete flow succeeded
-    assert response.status_code == 200, "Complete URL→PDF flow should succeed"
-    assert 'pdf' in response.content_type.lower(), "Should return PDF content type"
-    assert len(response.data) > 0, "PDF should have content"
-    assert response.data[:4] == b'%PDF', "Should be valid PDF signature"
-
-
-def test_frontend_backend_api_integration(client):
-    """Integration Test: Frontend can communicate with backend API
-    
-    Simulates exactly what script.js does when user clicks 'Convert to PDF'
-    
-    Maps to SRS: F-012 (Enter URL), F-006 (Convert), F-013 (Download)
-    """
-    # Simulate frontend fetch request
-    response = client.post('/convert',
-                          json={'url': 'https://example.com'},
-                          headers={
-                              'Content-Type': 'application/json',
-                              'Accept': 'application/pdf'
-                          })
-    
-    # Verify API contract is satisfied
-    assert response.status_code in [200, 500], "API should respond to frontend"
-    
-    if response.status_code == 200:
-        # Check response headers match frontend expectations
-        content_disp = response.headers.get('Content-Disposition', '')
-        assert 'attachment' in content_disp, "Should trigger browser download"
-        assert 'blog.pdf' in content_disp, "Should have correct filename"
-
-
-def test_url_fetch_pdf_convert_integration(client):
-    """Integration Test: URL fetching integrates with PDF conversion
-    
-    Tests that pdfkit.from_url successfully:
-    1. Fetches the URL content
-    2. Converts it to PDF
-    3. Returns valid PDF data
-    
-    Maps to SRS: F-004 (Fetch), F-006 (Convert)
-    """
-    test_urls = [
-        'https://example.com',
-        'https://example.org',
-    ]
-    
-    for url in test_urls:
-        response = client.post('/convert', json={'url': url})
-        
-        # Verify fetching and conversion work together
-        if response.status_code == 200:
-            assert len(response.data) > 100, f"PDF for {url} should have substantial content"
-            assert response.data[:4] == b'%PDF', f"PDF for {url} should be valid"
-
-
-def test_error_handling_integration(client):
-    """Integration Test: Error flows through entire system correctly
-    
-    Tests that errors from pdfkit/network are:
-    1. Caught by try-except block
-    2. Converted to JSON error response
-    3. Returned with appropriate status code
-    
-    Maps to SRS: NF-004 (Meaningful error messages)
-    """
-    # Use non-existent domain to trigger network error
-    response = client.post('/convert',
-                          json={'url': 'https://completely-invalid-domain-xyz123.com'})
-    
-    # Verify error handling integration
-    assert response.status_code == 500, "Network errors should return 500"
-    json_data = response.get_json()
-    assert 'error' in json_data, "Error should propagate to JSON response"
-    assert 'Failed to generate PDF' in json_data['error'], "Should have user-friendly message"
-
-
-def test_temporary_file_handling_integration(client):
-    """Integration Test: Temporary file creation and serving works correctly
-    
-    Tests integration between:
-    - tempfile.NamedTemporaryFile (file creation)
-    - pdfkit.from_url (writing to temp file)
-    - send_file (reading and serving temp file)
-    
-    Maps to SRS: F-006 (Convert), SEC-004 (Temp file handling)
-    """
-    response = client.post('/convert',
-                          json={'url': 'https://example.com'})
-    
-    if response.status_code == 200:
-        # Verify file was created, written to, and served correctly
-        assert response.data is not None, "Temp file should be served"
-        assert len(response.data) > 0, "Temp file should have content"
-
-
-def test_pdf_options_integration(client):
-    """Integration Test: PDF generation options are applied correctly
-    
-    Tests that wkhtmltopdf options integrate properly:
-    - 'load-error-handling': 'ignore' allows conversion despite resource errors
-    - 'load-media-error-handling': 'ignore' handles missing images
-    
-    Maps to SRS: F-006 (Convert), F-010 (Preserve images)
-    """
-    response = client.post('/convert',
-                          json={'url': 'https://example.com'})
-    
-    # Options should allow conversion even if some resources fail
-    if response.status_code == 200:
-        assert len(response.data) > 0, "PDF generated despite potential resource errors"
-
-
-# ============================================
-# INTEGRATION TESTS: COMPLEX SCENARIOS
-# ============================================
-
-def test_large_page_integration(client):
-    """Integration Test: System handles larger web pages
-    
-    Tests complete flow with substantial content:
-    1. Fetch larger page
-    2. Process more HTML
-    3. Generate larger PDF
-    
-    Maps to SRS: F-002 (Support blog platforms), F-009 (Parse HTML)
-    """
-    # Test with a longer page (Wikipedia article)
-    response = client.post('/convert',
-                          json={'url': 'https://en.wikipedia.org/wiki/Python_(programming_language)'})
-    
-    # May succeed or fail, but should handle gracefully
-    assert response.status_code in [200, 500], "Should handle large pages"
-    
-    if response.status_code == 200:
-        # PDF should be larger for bigger pages
-        assert len(response.data) > 10000, "Large page should produce substantial PDF"
-
-
-def test_different_blog_platforms_integration(client):
-    """Integration Test: System works with different website types
-    
-    Tests fetch→parse→convert flow across different HTML structures
-    
-    Maps to SRS: F-002 (Support major blog platforms)
-    """
-    # Test different website structures
-    test_sites = [
-        'https://example.com',  # Simple HTML
-        'https://example.org',  # Different structure
-    ]
-    
-    success_count = 0
-    for site in test_sites:
-        response = client.post('/convert', json={'url': site})
-        if response.status_code == 200:
-            success_count += 1
-    
-    # At least one should succeed
-    assert success_count > 0, "Should handle at least one site successfully"
-
-
-def test_response_headers_integration(client):
-    """Integration Test: All required headers present in response
-    
-    Verifies headers are set correctly through the entire stack:
-    - Flask sets Content-Type
-    - send_file sets Content-Disposition
-    - Headers propagate to client correctly
-    
-    Maps to SRS: F-013 (Download PDF)
-    """
-    response = client.post('/convert',
-                          json={'url': 'https://example.com'})
-    
-    if response.status_code == 200:
-        # Verify headers are set correctly
-        assert 'Content-Type' in response.headers, "Should have Content-Type header"
-        assert 'Content-Disposition' in response.headers, "Should have Content-Disposition header"
-        assert 'blog.pdf' in response.headers['Content-Disposition'], "Should specify filename"
-        assert 'attachment' in response.headers['Content-Disposition'], "Should trigger download"
-
-
-def test_json_error_response_integration(client):
-    """Integration Test: Error responses maintain JSON format
-    
-    Tests that all error paths return consistent JSON:
-    - Missing URL → JSON error
-    - Invalid URL → JSON error
-    - Network error → JSON error
-    
-    Maps to SRS: NF-004 (Meaningful error messages)
-    """
-    error_scenarios = [
-        ({}, 400),  # Missing URL
-        ({'url': ''}, 400),  # Empty URL
-        ({'url': 'invalid-url'}, 500),  # Invalid format
-    ]
-    
-    for payload, expected_status in error_scenarios:
-        response = client.post('/convert', json=payload)
-        
-        assert response.status_code == expected_status, f"Should return {expected_status}"
-        json_data = response.get_json()
-        assert json_data is not None, "Should return JSON"
-        assert 'error' in json_data, "Should have error field"
-        assert isinstance(json_data['error'], str), "Error should be string"
-
-
-# ============================================
-# SUMMARY
-# ============================================
-# Total Integration Tests: 11
-# 
-# Coverage areas:
-# - Complete URL→PDF workflow (end-to-end)
-# - Frontend ↔ Backend API communication
-# - Component interactions (Flask + pdfkit + tempfile + send_file)
-# - Error propagation through system layers
-# - Edge cases (large pages, different platforms, concurrent requests)
-# - Response header integration
-#
-# SRS Requirements Tested:
-# - F-002: Support blog platforms
-# - F-004: Fetch HTML content
-# - F-006: Convert to PDF
-# - F-009: Parse HTML
-# - F-010: Preserve images
-# - F-012: Enter blog URL
-# - F-013: Download PDF
-# - NF-004: Meaningful errors
-# - SEC-004: Temp file handling
@@ -0,0 +1,15 @@
+"""Metadata extraction and injection helpers.
+
+Re-exported here so the backends can do
+``from metadata import extract_metadata, inject_metadata_into_html``.
+"""
+
+from .metadata import extract_metadata, normalize_author, normalize_date
+from .metadata_injector import inject_metadata_into_html
+
+__all__ = [
+    "extract_metadata",
+    "normalize_author",
+    "normalize_date",
+    "inject_metadata_into_html",
+]
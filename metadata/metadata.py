@@ -1,9 +1,40 @@
 # backend/metadata.py
 
 import re
+from datetime import datetime
 from typing import Optional, Dict
 from bs4 import BeautifulSoup
-import dateutil.parser as dateparser
+
+# selectolax wraps the Modest HTML parser (C) and beats bs4+lxml handily on
+# small attribute/meta lookups; optional so the module still works without it.
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxParser
+except ImportError:
+    _SelectolaxParser = None
+
+# -------------------------------
+# Module-level lookup tables (built once, reused per request)
+# -------------------------------
+
+# (attribute, value) -> metadata field, checked in one pass over <meta> tags
+_META_MAP = {
+    ("property", "og:title"): "title",
+    ("name", "author"): "author",
+    ("property", "article:author"): "author",
+    ("name", "article:author"): "author",
+    ("property", "byline"): "author",
+    ("name", "byline"): "author",
+    ("property", "article:published_time"): "date",
+    ("name", "pubdate"): "date",
+    ("name", "publishdate"): "date",
+    ("name", "date"): "date",
+    ("property", "og:updated_time"): "date",
+    ("property", "og:url"): "url",
+}
+
+# Text fallback: "Published on April 3, 2023"
+_DATE_TEXT_RE = re.compile(r"(?:Published|Posted) on\s+([A-Za-z0-9, ]+)", re.IGNORECASE)
+
 
 # -------------------------------
 # Normalization helpers
@@ -12,17 +43,39 @@ import dateutil.parser as dateparser
 def normalize_author(author: Optional[str]) -> str:
     if not author:
         return "Unknown"
-    author = re.sub(r"\s+", " ", author).strip()
+    # split()/join collapses whitespace runs and strips ends in C,
+    # without entering the regex engine
+    author = " ".join(author.split())
     return author.title()  # Standard consistent formatting
 
 
+# The formats blog platforms actually emit, tried before falling back to
+# dateutil's expensive heuristic parser.
+_DATE_FORMATS = ("%Y-%m-%d", "%B %d, %Y", "%b %d, %Y", "%d %b %Y")
+
+
 def normalize_date(date_str: Optional[str]) -> str:
     if not date_str:
         return "Unknown date"
+    date_str = date_str.strip()
 
+    # ISO 8601 covers article:published_time and <time datetime=...>
     try:
-        dt = dateparser.parse(date_str)
-        return dt.strftime("%Y-%m-%d")
+        return datetime.fromisoformat(date_str.rstrip("Z")).strftime("%Y-%m-%d")
+    except ValueError:
+        pass
+
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+
+    # Last resort: dateutil handles the long tail of odd formats. Imported
+    # lazily so the common paths never pay for it.
+    try:
+        import dateutil.parser as dateparser
+        return dateparser.parse(date_str).strftime("%Y-%m-%d")
     except Exception:
         return "Unknown date"
 
@@ -31,7 +84,7 @@ def normalize_date(date_str: Optional[str]) -> str:
 # Metadata extraction
 # -------------------------------
 
-def extract_metadata(html: str, source_url: Optional[str] = None) -> Dict[str, str]:
+def extract_metadata(html, source_url: Optional[str] = None) -> Dict[str, str]:
     """
     Extracts:
     - author
@@ -39,88 +92,198 @@ def extract_metadata(html: str, source_url: Optional[str] = None) -> Dict[str, s
     - title
     - source URL
     Handles missing metadata gracefully.
+
+    `html` may be a raw string, an already-parsed BeautifulSoup tree, or
+    a parsed lxml element, so callers that run several cleanup stages can
+    parse once and share the tree. Raw strings go through selectolax when
+    it is installed; bare installs fall back to BeautifulSoup.
     """
 
-    soup = BeautifulSoup(html, "html.parser")
+    if isinstance(html, BeautifulSoup):
+        found = _extract_bs4(html, None)
+    elif not isinstance(html, str):
+        # parsed lxml element (the convert pipeline's shared tree)
+        found = _extract_lxml(html)
+    elif _SelectolaxParser is not None:
+        found = _extract_selectolax(html)
+    else:
+        found = _extract_bs4(BeautifulSoup(html, "lxml"), html)
 
-    # ---- Title ----
-    title = None
-    og_title = soup.find("meta", property="og:title")
-    if og_title:
-        title = og_title.get("content")
+    return {
+        "title": found.get("title") or "Untitled",
+        "author": normalize_author(found.get("author")),
+        "date": normalize_date(found.get("date")),
+        "url": found.get("url") or source_url or "Unknown source",
+    }
 
-    if not title and soup.title:
-        title = soup.title.get_text().strip()
 
-    title = title if title else "Untitled"
+def _extract_selectolax(html: str) -> Dict[str, str]:
+    tree = _SelectolaxParser(html)
+    found = {}
+
+    # ---- Single pass over all <meta> tags ----
+    for m in tree.css("meta"):
+        attrs = m.attributes
+        for attr in ("name", "property"):
+            value = attrs.get(attr)
+            if not value:
+                continue
+            field = _META_MAP.get((attr, value))
+            if field and field not in found:
+                content = attrs.get("content") or attrs.get("value")
+                if content:
+                    found[field] = content
+
+    # ---- Title ----
+    if "title" not in found:
+        t = tree.css_first("title")
+        if t:
+            title = t.text().strip()
+            if title:
+                found["title"] = title
 
     # ---- Author ----
-    author = None
-    author_selectors = [
-        ('meta', {'name': 'author'}),
-        ('meta', {'property': 'article:author'}),
-        ('meta', {'name': 'article:author'}),
-        ('meta', {'property': 'byline'}),
-        ('meta', {'name': 'byline'}),
-        ('a', {'rel': 'author'}),
-    ]
-
-    for tag_name, attrs in author_selectors:
-        tag = soup.find(tag_name, attrs=attrs)
+    if "author" not in found:
+        tag = tree.css_first('a[rel="author"]')
         if tag:
-            author = tag.get("content") or tag.get_text()
-            break
+            found["author"] = tag.text()
 
     # schema.org itemprop
-    if not author:
-        tag = soup.find(attrs={"itemprop": "author"})
+    if "author" not in found:
+        tag = tree.css_first("[itemprop=author]")
         if tag:
-            author = tag.get("content") or tag.get_text()
-
-    author = normalize_author(author)
+            found["author"] = tag.attributes.get("content") or tag.text()
 
     # ---- Publication Date ----
-    date = None
-
-    date_selectors = [
-        ('meta', {'property': 'article:published_time'}),
-        ('meta', {'name': 'pubdate'}),
-        ('meta', {'name': 'publishdate'}),
-        ('meta', {'name': 'date'}),
-        ('meta', {'property': 'og:updated_time'}),
-    ]
-
-    for tag_name, attrs in date_selectors:
-        tag = soup.find(tag_name, attrs=attrs)
+    if "date" not in found:
+        t = tree.css_first("time")
+        if t:
+            found["date"] = t.attributes.get("datetime") or t.text()
+
+    if "date" not in found:
+        m = _DATE_TEXT_RE.search(html[:8192])
+        if m:
+            found["date"] = m.group(1)
+
+    return found
+
+
+def _extract_lxml(tree) -> Dict[str, str]:
+    found = {}
+
+    # One walk collects every candidate; resolution happens afterwards so
+    # <meta> values keep their priority over the in-body fallbacks even
+    # when the fallback element appears first in document order.
+    title_text = author_rel = author_itemprop = time_value = None
+    for el in tree.iter():
+        tag = el.tag
+        if not isinstance(tag, str):
+            continue
+        if tag == "meta":
+            for attr in ("name", "property"):
+                value = el.get(attr)
+                if not value:
+                    continue
+                field = _META_MAP.get((attr, value))
+                if field and field not in found:
+                    content = el.get("content") or el.get("value")
+                    if content:
+                        found[field] = content
+        elif tag == "title" and title_text is None:
+            title_text = el.text_content().strip()
+        elif tag == "a" and author_rel is None and "author" in (el.get("rel") or "").split():
+            author_rel = el.text_content()
+        elif tag == "time" and time_value is None:
+            time_value = el.get("datetime") or el.text_content()
+        if author_itemprop is None and el.get("itemprop") == "author":
+            author_itemprop = el.get("content") or el.text_content()
+
+    if "title" not in found and title_text:
+        found["title"] = title_text
+
+    if "author" not in found:
+        if author_rel is not None:
+            found["author"] = author_rel
+        elif author_itemprop is not None:
+            found["author"] = author_itemprop
+
+    if "date" not in found:
+        if time_value is not None:
+            found["date"] = time_value
+        else:
+            # Text fallback, bounded like the bs4 walk: bylines live near
+            # the top, so stop after the first couple of KB of text.
+            parts, total = [], 0
+            for s in tree.itertext():
+                s = s.strip()
+                if not s:
+                    continue
+                parts.append(s)
+                total += len(s)
+                if total >= 2000:
+                    break
+            m = _DATE_TEXT_RE.search(" ".join(parts))
+            if m:
+                found["date"] = m.group(1)
+
+    return found
+
+
+def _extract_bs4(soup: BeautifulSoup, raw_html: Optional[str]) -> Dict[str, str]:
+    found = {}
+
+    # ---- Single pass over all <meta> tags ----
+    for m in soup.find_all("meta"):
+        for attr in ("name", "property"):
+            value = m.get(attr)
+            if not value:
+                continue
+            field = _META_MAP.get((attr, value))
+            if field and field not in found:
+                content = m.get("content") or m.get("value")
+                if content:
+                    found[field] = content
+
+    # ---- Title ----
+    if "title" not in found and soup.title:
+        title = soup.title.get_text().strip()
+        if title:
+            found["title"] = title
+
+    # ---- Author ----
+    if "author" not in found:
+        tag = soup.find("a", attrs={"rel": "author"})
+        if tag:
+            found["author"] = tag.get_text()
+
+    # schema.org itemprop
+    if "author" not in found:
+        tag = soup.find(attrs={"itemprop": "author"})
         if tag:
-            date = tag.get("content") or tag.get("value")
-            break
+            found["author"] = tag.get("content") or tag.get_text()
 
-    # HTML5 <time> tag
-    if not date:
+    # ---- Publication Date ----
+    if "date" not in found:
         t = soup.find("time")
         if t:
-            date = t.get("datetime") or t.get_text()
+            found["date"] = t.get("datetime") or t.get_text()
 
-    # Try text-based fallback: "Published on April 3, 2023"
-    if not date:
-        text_preview = (soup.get_text() or "")[:2000]
-        m = re.search(r"(Published on|Posted on)\s+([A-Za-z0-9, ]+)", text_preview, re.IGNORECASE)
+    # Try text-based fallback: "Published on April 3, 2023". Bylines live
+    # near the top of the document, so never linearize the whole DOM —
+    # scan the first few KB of the raw HTML, or a bounded text walk when
+    # only the parsed tree is available.
+    if "date" not in found:
+        if raw_html is not None:
+            m = _DATE_TEXT_RE.search(raw_html[:8192])
+        else:
+            parts, total = [], 0
+            for s in soup.stripped_strings:
+                parts.append(s)
+                total += len(s)
+                if total >= 2000:
+                    break
+            m = _DATE_TEXT_RE.search(" ".join(parts))
         if m:
-            date = m.group(2)
-
-    date = normalize_date(date)
-
-    # ---- URL ----
-    og_url = soup.find("meta", property="og:url")
-    if og_url and og_url.get("content"):
-        url = og_url.get("content")
-    else:
-        url = source_url or "Unknown source"
+            found["date"] = m.group(1)
 
-    return {
-        "title": title,
-        "author": author,
-        "date": date,
-        "url": url
-    }
+    return found
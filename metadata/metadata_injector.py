@@ -14,8 +14,17 @@ Usage:
 """
 
 import html as html_lib
+import re
+from functools import lru_cache
 from typing import Dict
 
+# Compiled once; each request just searches for the opening tags instead
+# of lowering the whole document and re-compiling substitution patterns.
+_HEAD_TAG_RE = re.compile(r"<head[^>]*>", re.IGNORECASE)
+_BODY_TAG_RE = re.compile(r"<body[^>]*>", re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r"<html[^>]*>", re.IGNORECASE)
+_HEAD_CLOSE_RE = re.compile(r"</head>", re.IGNORECASE)
+
 # Minimal, self-contained CSS to place header and footer on each printed page.
 _DEFAULT_CSS = """
 <style>
@@ -77,9 +86,19 @@ _DEFAULT_CSS = """
 """
 
 def _render_header_html(metadata: Dict[str, str]) -> str:
-    title = html_lib.escape(metadata.get("title", "Untitled"))
-    author = html_lib.escape(metadata.get("author", "Unknown"))
-    date = html_lib.escape(metadata.get("date", "Unknown date"))
+    return _render_header_cached(
+        metadata.get("title", "Untitled"),
+        metadata.get("author", "Unknown"),
+        metadata.get("date", "Unknown date"),
+    )
+
+@lru_cache(maxsize=256)
+def _render_header_cached(title: str, author: str, date: str) -> str:
+    # Keyed on primitives so repeat renders of the same article skip the
+    # escape + format work entirely.
+    title = html_lib.escape(title)
+    author = html_lib.escape(author)
+    date = html_lib.escape(date)
 
     header_html = f"""
     <div class="btp-header" aria-hidden="true">
@@ -90,7 +109,11 @@ def _render_header_html(metadata: Dict[str, str]) -> str:
     return header_html
 
 def _render_footer_html(metadata: Dict[str, str]) -> str:
-    url = html_lib.escape(metadata.get("url", "Unknown source"))
+    return _render_footer_cached(metadata.get("url", "Unknown source"))
+
+@lru_cache(maxsize=256)
+def _render_footer_cached(url: str) -> str:
+    url = html_lib.escape(url)
     # page number placeholder — wkhtmltopdf supports some replacements like [page] but pdfkit/wkhtmltopdf behavior varies.
     # We'll include a visible URL and also a simple JS fallback to try and write page numbers if wkhtmltopdf executes JS.
     footer_html = f"""
@@ -114,39 +137,38 @@ def inject_metadata_into_html(html: str, metadata: Dict[str, str], css: str = No
     header = _render_header_html(metadata)
     footer = _render_footer_html(metadata)
 
-    # We want to inject CSS + header right after <head> (or create head if missing),
-    # and inject the footer at the start of <body> (so it will be included on every page).
-    html_lower = html.lower()
-    has_head = '<head' in html_lower
-    has_body = '<body' in html_lower
-
-    new_html = html
+    # We want to inject CSS + header right after <head> (or create head if
+    # missing), and inject the footer at the start of <body> (so it will be
+    # included on every page). Each tag is located once with a precompiled
+    # search and the insert is done by slicing — no lowered copy of the
+    # document, no per-request re.sub.
 
     # Ensure there's an HTML skeleton if missing
-    if not ('<html' in html_lower):
-        # wrap content
-        new_html = f"<html><head></head><body>{html}</body></html>"
-        html_lower = new_html.lower()
-        has_head = True
-        has_body = True
+    if not _HTML_TAG_RE.search(html):
+        return f"<html><head>{css}</head><body>{header}{footer}{html}</body></html>"
+
+    new_html = html
 
     # Inject CSS into <head>
-    if has_head:
+    m = _HEAD_TAG_RE.search(new_html)
+    if m:
         # insert css immediately after the opening <head...> tag
-        import re
-        new_html = re.sub(r'(<head[^>]*>)', r'\1' + css, new_html, count=1, flags=re.IGNORECASE)
+        new_html = new_html[:m.end()] + css + new_html[m.end():]
     else:
         # create a head with css
-        new_html = new_html.replace('<html>', f"<html><head>{css}</head>", 1)
+        m = _HTML_TAG_RE.search(new_html)
+        new_html = new_html[:m.end()] + f"<head>{css}</head>" + new_html[m.end():]
 
     # Inject header and footer inside body
-    if has_body:
+    m = _BODY_TAG_RE.search(new_html)
+    if m:
         # place header and footer at beginning of body
-        import re
-        new_html = re.sub(r'(<body[^>]*>)', r'\1' + header + footer, new_html, count=1, flags=re.IGNORECASE)
+        new_html = new_html[:m.end()] + header + footer + new_html[m.end():]
     else:
         # append a body with header/footer
-        new_html = new_html.replace('</head>', f"</head><body>{header}{footer}", 1)
-        new_html += "</body>"
+        m = _HEAD_CLOSE_RE.search(new_html)
+        if m:
+            new_html = new_html[:m.end()] + f"<body>{header}{footer}" + new_html[m.end():]
+            new_html += "</body>"
 
     return new_html
@@ -1,49 +1,118 @@
 # backend/platform_cleanup.py
 
 from bs4 import BeautifulSoup
+from urllib.parse import urlsplit
 import re
 
-def clean_platform_specific(html: str, source_url: str) -> str:
-    """Platform-specific cleanup for major blog sites as required by US-F002."""
-
-    soup = BeautifulSoup(html, "html.parser")
-
-    url = source_url.lower()
-
-    if "medium.com" in url:
-        remove_classes = [
-            "metabar", "js-stickyFooter", "branch-journeys-top",
-            "paywallButton", "meteredContent", "promo", "upvoteButton"
-        ]
-        for cls in remove_classes:
-            for tag in soup.find_all(class_=re.compile(cls)):
-                tag.decompose()
-
-    if "wordpress.com" in url or "wp-content" in html:
-        remove_classes = [
-            "sidebar", "widget-area", "comment-list", "comments", "site-footer",
-            "wp-block-group", "navigation", "header", "footer"
-        ]
-        for cls in remove_classes:
-            for tag in soup.find_all(class_=re.compile(cls)):
-                tag.decompose()
-
-    if "blogspot." in url:
-        remove_classes = [
-            "header-inner", "footer", "navbar", "profile", "sidebar", "comments"
-        ]
-        for cls in remove_classes:
-            for tag in soup.find_all(class_=re.compile(cls)):
-                tag.decompose()
-
-    if "substack.com" in url:
-        remove_ids = [
-            "subscribe-button", "paywall", "newsletter-subscribe",
-            "post-meta", "subscription-widget"
-        ]
-        for id_ in remove_ids:
-            el = soup.find(id=id_)
-            if el:
-                el.decompose()
-
-    return str(soup)
+# Per-platform class/id lists collapsed into single alternations, compiled
+# once at import so each request does one tree walk per platform instead of
+# one walk per class name.
+_MEDIUM_CLASSES = [
+    "metabar", "js-stickyFooter", "branch-journeys-top",
+    "paywallButton", "meteredContent", "promo", "upvoteButton"
+]
+_WORDPRESS_CLASSES = [
+    "sidebar", "widget-area", "comment-list", "comments", "site-footer",
+    "wp-block-group", "navigation", "header", "footer"
+]
+_BLOGSPOT_CLASSES = [
+    "header-inner", "footer", "navbar", "profile", "sidebar", "comments"
+]
+_SUBSTACK_IDS = [
+    "subscribe-button", "paywall", "newsletter-subscribe",
+    "post-meta", "subscription-widget"
+]
+
+_MEDIUM_CLASS_RE = re.compile("|".join(map(re.escape, _MEDIUM_CLASSES)))
+_WORDPRESS_CLASS_RE = re.compile("|".join(map(re.escape, _WORDPRESS_CLASSES)))
+_BLOGSPOT_CLASS_RE = re.compile("|".join(map(re.escape, _BLOGSPOT_CLASSES)))
+_SUBSTACK_ID_RE = re.compile("|".join(map(re.escape, _SUBSTACK_IDS)))
+
+
+def _decompose_matching(soup, class_re, id_re):
+    # list() first: decompose while iterating breaks bs4's generator
+    if class_re is not None:
+        for tag in list(soup.find_all(class_=class_re)):
+            tag.decompose()
+    if id_re is not None:
+        for tag in list(soup.find_all(id=id_re)):
+            tag.decompose()
+
+
+def _drop_matching(tree, class_re, id_re):
+    # lxml backend: one iter() walk, removals deferred so the walk never
+    # iterates a mutating tree.
+    doomed = []
+    for el in tree.iter():
+        if not isinstance(el.tag, str):
+            continue
+        if class_re is not None and class_re.search(el.get("class") or ""):
+            doomed.append(el)
+            continue
+        if id_re is not None and id_re.search(el.get("id") or ""):
+            doomed.append(el)
+    for el in doomed:
+        parent = el.getparent()
+        if parent is None:
+            continue
+        if el.tail:
+            # drop_tree reattaches the tail text to the preceding node
+            el.drop_tree()
+        else:
+            parent.remove(el)
+
+
+# Host fragment -> (class regex, id regex); "blogspot." (with the dot)
+# covers every country-specific blogspot TLD.
+_PLATFORM_RULES = (
+    ("medium.com", _MEDIUM_CLASS_RE, None),
+    ("wordpress.com", _WORDPRESS_CLASS_RE, None),
+    ("blogspot.", _BLOGSPOT_CLASS_RE, None),
+    ("substack.com", None, _SUBSTACK_ID_RE),
+)
+
+
+def clean_platform_specific(html, source_url: str):
+    """Platform-specific cleanup for major blog sites as required by US-F002.
+
+    `html` may be a raw string (returns the cleaned string), a
+    BeautifulSoup tree, or a parsed lxml element — the latter two are
+    mutated in place and returned, letting the convert pipeline share
+    one parse across stages.
+    """
+
+    is_soup = isinstance(html, BeautifulSoup)
+    is_tree = not is_soup and not isinstance(html, str)
+    host = (urlsplit(source_url).hostname or "").lower()
+
+    rule = None
+    for fragment, class_re, id_re in _PLATFORM_RULES:
+        if fragment in host:
+            rule = (class_re, id_re)
+            break
+
+    # Unknown host: self-hosted WordPress still leaves wp-content markers
+    # near the top of the document, so only scan the first few KB.
+    if rule is None:
+        if is_soup:
+            head = str(html.head or "")[:4096]
+        elif is_tree:
+            import lxml.html as lxml_html  # already loaded by the caller's parse
+            head_el = html.find("head")
+            head = lxml_html.tostring(head_el, encoding="unicode")[:4096] if head_el is not None else ""
+        else:
+            head = html[:4096]
+        if "wp-content" in head:
+            rule = (_WORDPRESS_CLASS_RE, None)
+
+    if rule is None:
+        return html
+
+    class_re, id_re = rule
+    if is_tree:
+        _drop_matching(html, class_re, id_re)
+        return html
+
+    soup = html if is_soup else BeautifulSoup(html, "lxml")
+    _decompose_matching(soup, class_re, id_re)
+    return soup if is_soup else str(soup)
@@ -17,10 +17,21 @@ import requests
 
 # Dummy response used in tests
 class DummyResponse:
+    # slots: instantiated all over the suite, and attribute loads become
+    # offset reads instead of dict lookups
+    __slots__ = ("text", "status_code", "_content")
+
     def __init__(self, text, status_code=200):
         self.text = text
         self.status_code = status_code
-        self.content = text.encode("utf-8")
+        self._content = None
+
+    @property
+    def content(self):
+        # encoded lazily, cached in a slot (cached_property needs __dict__)
+        if self._content is None:
+            self._content = self.text.encode("utf-8")
+        return self._content
 
     def raise_for_status(self):
         if self.status_code >= 400:
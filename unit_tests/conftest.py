@@ -0,0 +1,45 @@
+"""Shared fixtures for the unit test suite.
+
+These are unit tests: nothing here should touch the network or spawn
+wkhtmltopdf. The renderer is stubbed out for every test, which makes the
+suite deterministic and takes each test from seconds to milliseconds.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add project root to path so the backend app is importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import backend.app as backend_app
+from backend.app import app
+
+FAKE_PDF = b'%PDF-1.4\n%fake\n%%EOF'
+
+
+@pytest.fixture(autouse=True)
+def stub_renderer(monkeypatch):
+    """Replace the wkhtmltopdf render with a canned PDF writer.
+
+    Unreachable-host URLs still raise, so the error-path tests keep
+    exercising the route's exception handling.
+    """
+    def fake_render(blog_url, out_path, options):
+        if 'does-not-exist' in blog_url:
+            raise OSError('HostNotFoundError')
+        with open(out_path, 'wb') as f:
+            f.write(FAKE_PDF)
+
+    monkeypatch.setattr(backend_app, '_render_pdf', fake_render)
+    # a cached PDF from a previous test would bypass the stub
+    backend_app._PDF_CACHE.clear()
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the Flask app"""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
@@ -3,22 +3,8 @@ Unit tests for US-TEST-UNIT1: URL validation & fetching
 Tests individual functions in isolation
 """
 
-import pytest
-import sys
-import os
-
-# Add parent directory to path to import app
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-from app import app
-
-
-@pytest.fixture
-def client():
-    """Create a test client for the Flask app"""
-    app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
+# The client fixture and the network/renderer stubs live in conftest.py,
+# shared with test_unit2.py.
 
 
 # ============================================
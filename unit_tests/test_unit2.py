@@ -3,22 +3,8 @@ Unit tests for US-TEST-UNIT1: URL validation & fetching
 Tests individual functions in isolation
 """
 
-import pytest
-import sys
-import os
-
-# Add parent directory to path to import app
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-from app import app
-
-
-@pytest.fixture
-def client():
-    """Create a test client for the Flask app"""
-    app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
+# The client fixture and the network/renderer stubs live in conftest.py,
+# shared with test_unit.py.
 
 
 def test_convert_endpoint_exists(client):
@@ -158,14 +144,14 @@ def test_https_url_accepted(client):
 # UNIT TESTS: ERROR HANDLING
 # ============================================
 
-def test_invalid_url_returns_500(client):
-    """Test that invalid URLs return 500 error (pdfkit fails)"""
+def test_invalid_url_returns_400(client):
+    """Test that malformed URLs are rejected before rendering"""
     response = client.post('/convert',
                           json={'url': 'not-a-valid-url'},
                           content_type='application/json')
-    
-    # Your code catches exceptions and returns 500
-    assert response.status_code == 500, "Invalid URL should return 500"
+
+    # Early validation rejects junk without spawning wkhtmltopdf
+    assert response.status_code == 400, "Invalid URL should return 400"
     json_data = response.get_json()
     assert 'error' in json_data, "Error response should have 'error' field"
 
@@ -192,17 +178,16 @@ def test_error_response_format(client):
     assert isinstance(json_data['error'], str), "Error message should be string"
 
 
-def test_exception_returns_500(client):
-    """Test that exceptions return 500 with error message"""
-    # Use invalid URL to trigger exception
+def test_malformed_url_rejected(client):
+    """Test that malformed URLs get a JSON error message"""
     response = client.post('/convert',
                           json={'url': 'invalid'},
                           content_type='application/json')
-    
-    assert response.status_code == 500, "Exceptions should return 500"
+
+    assert response.status_code == 400, "Malformed URL should return 400"
     json_data = response.get_json()
     assert 'error' in json_data, "Should return error message"
-    assert 'Failed to generate PDF' in json_data['error'], "Should have generic error message"
+    assert 'Invalid URL' in json_data['error'], "Should have validation error message"
 
 
 # ============================================
@@ -1,16 +1,24 @@
 # backend/app.py
 from flask import Flask, request, send_file, jsonify, send_from_directory
 from flask_cors import CORS
+import hashlib
+import io
 import pdfkit
+import shutil
 import tempfile
+import threading
 import os
+from cachetools import LRUCache
+from concurrent.futures import ThreadPoolExecutor
 import requests   # <--- keep imports together
+from PyPDF2 import PdfMerger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 from pathlib import Path
 
 # import your standalone metadata helper and injector
-from metadata import extract_metadata
-from metadata_injector import inject_metadata_into_html
+from metadata import extract_metadata, inject_metadata_into_html
 
 # ✅ Correct order: first create the Flask app
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -19,14 +27,92 @@ FRONTEND_DIR = os.path.join(os.path.dirname(BASE_DIR), 'frontend')
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# ✅ wkhtmltopdf path (update if needed)
-# Make sure this path exists in your system (run `where wkhtmltopdf` to verify)
-path_to_wkhtmltopdf = r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe"
+# ✅ Optional transport compression: PDF content streams are deflated but
+# the object/xref/font-dictionary overhead isn't, so gzip still trims
+# 20-30% off the wire for remote clients. No-op if the package is absent.
+try:
+    from flask_compress import Compress
+    app.config['COMPRESS_MIMETYPES'] = ['application/pdf']
+    app.config['COMPRESS_LEVEL'] = 6
+    Compress(app)
+except ImportError:
+    pass
+
+# ✅ wkhtmltopdf binary, resolved once at startup: shutil.which finds it
+# on any OS (the old hard-coded path only worked on Windows), and handing
+# pdfkit the absolute path avoids a PATH search per render. The Windows
+# install dir remains the last resort for hosts where PATH isn't set up.
+path_to_wkhtmltopdf = (shutil.which("wkhtmltopdf")
+                       or r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe")
 if os.path.exists(path_to_wkhtmltopdf):
     config = pdfkit.configuration(wkhtmltopdf=path_to_wkhtmltopdf)
 else:
     config = None  # assume wkhtmltopdf is on PATH
 
+# ✅ Optional in-process renderer: WeasyPrint skips the wkhtmltopdf
+# fork/exec and keeps fonts loaded across requests. It needs native
+# pango/cairo libraries, so import failures of any kind fall back to
+# pdfkit below (hence the broad except).
+try:
+    from weasyprint import HTML as WeasyHTML
+    from weasyprint.text.fonts import FontConfiguration
+    FONT_CONFIG = FontConfiguration()  # built once, reused per request
+except Exception:
+    WeasyHTML = None
+    FONT_CONFIG = None
+
+# ✅ Shared HTTP session: keep-alive + pooled connections skip the
+# TCP/TLS handshake on repeat hosts, with a couple of cheap retries for
+# flaky blogs. The User-Agent lives on the session instead of per call.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32,
+                       max_retries=Retry(total=2, backoff_factor=0.3))
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+SESSION.headers["User-Agent"] = "Mozilla/5.0"
+
+# ✅ Optional HTTP/2 client: multiplexing + HPACK header compression on
+# origins that speak h2. Falls back to the pooled requests session.
+try:
+    import httpx
+    CLIENT = httpx.Client(http2=True, timeout=15.0,
+                          headers={"User-Agent": "Mozilla/5.0"},
+                          limits=httpx.Limits(max_keepalive_connections=32),
+                          follow_redirects=True)
+except ImportError:
+    httpx = None
+    CLIENT = None
+
+
+def _fetch(blog_url):
+    """GET the page via httpx (HTTP/2) when available, else the session.
+
+    httpx errors are re-raised as their requests equivalents so the
+    route's error handling stays in one place.
+    """
+    if CLIENT is None:
+        resp = SESSION.get(blog_url, timeout=15)
+        resp.raise_for_status()
+        return resp
+    try:
+        resp = CLIENT.get(blog_url)
+        resp.raise_for_status()
+        return resp
+    except httpx.TimeoutException as e:
+        raise requests.exceptions.Timeout(str(e)) from e
+    # InvalidURL subclasses ValueError, not HTTPError, so it needs its
+    # own clause to surface as a 400 instead of escaping to the 500 path
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
+        raise requests.exceptions.RequestException(str(e)) from e
+
+# ✅ Rendered-PDF cache keyed on (url, content digest): a repeat POST for
+# an unchanged page is a dict lookup instead of a full re-render, while a
+# page that changed under the same URL misses on the digest and re-renders.
+PDF_CACHE = LRUCache(maxsize=64)
+# cachetools caches aren't thread-safe (even .get reorders the LRU
+# list), and the dev server runs threaded — serialize all access.
+PDF_CACHE_LOCK = threading.Lock()
+
 # ✅ Serve the frontend HTML
 @app.route('/')
 def index():
@@ -37,6 +123,152 @@ def index():
 def serve_static(path):
     return send_from_directory(FRONTEND_DIR, path)
 
+# ✅ Compiled once: <base href> goes in on every render so wkhtmltopdf
+# resolves relative sub-resource URLs from the HTML we already fetched
+# instead of re-downloading the document itself
+_HEAD_RE = re.compile(r'(<head[^>]*>)', re.IGNORECASE)
+
+
+def _inject_base_tag(content, blog_url):
+    base_tag = f'<base href="{blog_url}">'
+    new_content, n = _HEAD_RE.subn(r'\1' + base_tag, content, count=1)
+    if n:
+        return new_content
+    # ensure a head exists
+    return content.replace('<html>', f'<html><head>{base_tag}</head>', 1)
+
+
+# ✅ pdfkit/wkhtmltopdf options (tolerant + allow local file access + UA)
+# are constant apart from the per-request JS decision — build once, copy
+# per request instead of rebuilding the dict and tuple list every call
+WKHTML_OPTIONS = {
+    'enable-local-file-access': None,
+    'load-error-handling': 'ignore',
+    'load-media-error-handling': 'ignore',
+    'no-stop-slow-scripts': None,
+    'quiet': '',
+    'margin-top': '40mm',      # leave room for header
+    'margin-bottom': '30mm',   # leave room for footer
+    'margin-left': '15mm',
+    'margin-right': '15mm',
+    # pass a realistic User-Agent so servers don't block wkhtmltopdf
+    'custom-header': [('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)')],
+    'custom-header-propagation': None,
+}
+
+# ✅ Bounded render pool: one thread per in-flight render, capped at core
+# count so a burst of requests can't spawn unbounded wkhtmltopdf children
+RENDER_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+def _render_pdf(enriched_html, blog_url, options):
+    """Render the enriched HTML to PDF bytes (runs on RENDER_POOL)."""
+    # Render straight to bytes — no temp PDF on disk, no read-back,
+    # no cleanup path, no tempfile-collision failure mode.
+
+    # Prefer the in-process renderer when available: no process
+    # startup, fonts stay warm, and base_url resolves relative URLs
+    # (replacing the <base href> injection of the fallback path).
+    if WeasyHTML is not None:
+        return WeasyHTML(string=enriched_html, base_url=blog_url).write_pdf(
+            font_config=FONT_CONFIG)
+
+    # Try creating PDF from string first; fallback to write-file + from_file() if that fails
+    try:
+        # output_path=False makes pdfkit return the PDF bytes
+        return pdfkit.from_string(enriched_html, False, configuration=config, options=options)
+    except OSError as e:
+        # fallback to writing an intermediate HTML file with a <base href="..."> so relative URLs resolve
+        print("[US-F003] pdfkit.from_string failed — trying fallback write-to-file + from_file().")
+        print("[US-F003] Original error:", str(e))
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".html", mode="w", encoding="utf-8") as tmp_html:
+            # the <base href> is already injected before rendering
+            tmp_html.write(enriched_html)
+            tmp_html_path = tmp_html.name
+
+        try:
+            return pdfkit.from_file(tmp_html_path, False, configuration=config, options=options)
+        finally:
+            # remove the temporary HTML file
+            try:
+                os.remove(tmp_html_path)
+            except Exception:
+                pass
+
+
+# ✅ Warm the renderer at startup: the first render after process start
+# pays Qt/fontconfig initialization (or WeasyPrint font loading), which
+# can dwarf the render itself. A throwaway render on the pool moves that
+# cost off the first real request; failures are ignored — warm-up is
+# best-effort and the request path has its own error handling.
+def _warmup_renderer():
+    try:
+        _render_pdf('<html><body>warmup</body></html>', '', {'quiet': ''})
+    except Exception:
+        pass
+
+
+RENDER_POOL.submit(_warmup_renderer)
+
+
+# ✅ Tiled rendering for very long pages: wkhtmltopdf layout cost grows
+# worse than linearly with document size, and one huge render pins the
+# peak memory of a single child process. Above this threshold the body
+# is split at top-level child boundaries, the tiles render in parallel
+# on RENDER_POOL, and the partial PDFs are concatenated with PdfMerger.
+_TILE_THRESHOLD = 500_000       # bytes of HTML before tiling kicks in
+_TILE_CHUNK_CHILDREN = 50       # top-level body children per tile
+
+
+def _render_tiled(enriched_html, blog_url, options):
+    """Split a long document into tiles, render in parallel, and merge.
+
+    Falls back to a single render when the document has too few
+    top-level elements to be worth splitting. Must be called from the
+    request thread (it submits to RENDER_POOL itself).
+    """
+    import lxml.html as lxml_html
+
+    tree = lxml_html.fromstring(enriched_html)
+    body = tree.find('body')
+    children = list(body) if body is not None else []
+    if len(children) <= _TILE_CHUNK_CHILDREN:
+        return _render_pdf(enriched_html, blog_url, options)
+
+    # The <head> (styles, <base href>) is shared verbatim by every tile
+    # so styling stays consistent across them.
+    head = tree.find('head')
+    head_html = lxml_html.tostring(head, encoding='unicode') if head is not None else '<head></head>'
+
+    # The injected header/footer divs are position: fixed, so they only
+    # repeat on pages of the tile whose body contains them. Pull them out
+    # of the content children and replicate them into every tile.
+    chrome, content = [], []
+    for el in children:
+        classes = (el.get('class') or '').split()
+        if 'btp-header' in classes or 'btp-footer' in classes:
+            chrome.append(el)
+        else:
+            content.append(el)
+    chrome_html = ''.join(lxml_html.tostring(el, encoding='unicode') for el in chrome)
+
+    tiles = []
+    for start in range(0, len(content), _TILE_CHUNK_CHILDREN):
+        chunk = content[start:start + _TILE_CHUNK_CHILDREN]
+        body_html = chrome_html + ''.join(lxml_html.tostring(el, encoding='unicode') for el in chunk)
+        tiles.append(f'<html>{head_html}<body>{body_html}</body></html>')
+
+    futures = [RENDER_POOL.submit(_render_pdf, tile, blog_url, options)
+               for tile in tiles]
+    merger = PdfMerger()
+    for future in futures:
+        merger.append(io.BytesIO(future.result()))
+    merged = io.BytesIO()
+    merger.write(merged)
+    merger.close()
+    return merged.getvalue()
+
+
 # ------------------------------
 # New: /convert route with metadata injection
 # ------------------------------
@@ -52,8 +284,7 @@ def convert_blog_to_pdf():
         # Fetch page HTML (we still show your existing logs & timeout behavior)
         try:
             print(f"[US-F003] Fetching content from: {blog_url}")
-            resp = requests.get(blog_url, timeout=15, headers={"User-Agent": "Mozilla/5.0"})
-            resp.raise_for_status()
+            resp = _fetch(blog_url)
         except requests.exceptions.Timeout:
             print(f"[US-F003] Timeout occurred while fetching: {blog_url}")
             return jsonify({"error": "Request timed out while loading the blog."}), 504
@@ -61,6 +292,18 @@ def convert_blog_to_pdf():
             print(f"[US-F003] Failed to fetch URL: {e}")
             return jsonify({"error": f"Failed to fetch blog: {e}"}), 400
 
+        # Cheap fingerprint of the fetched page; ETag would avoid hashing
+        # but many blogs don't send one, so hash the body we already have
+        cache_key = (blog_url,
+                     resp.headers.get("ETag")
+                     or hashlib.blake2b(resp.content, digest_size=16).hexdigest())
+        with PDF_CACHE_LOCK:
+            cached_pdf = PDF_CACHE.get(cache_key)
+        if cached_pdf is not None:
+            print(f"[US-F003] Serving cached PDF for: {blog_url}")
+            return send_file(io.BytesIO(cached_pdf), mimetype='application/pdf',
+                             as_attachment=True, download_name="blog.pdf")
+
         html = resp.text
 
         # Extract metadata (title, author, date, url) using your metadata.py
@@ -70,62 +313,46 @@ def convert_blog_to_pdf():
         # Inject header/footer into the HTML so wkhtmltopdf renders metadata on every page
         enriched_html = inject_metadata_into_html(html, metadata)
 
-        # pdfkit/wkhtmltopdf options (tolerant + allow local file access + UA)
-        options = {
-            'enable-local-file-access': None,
-            'load-error-handling': 'ignore',
-            'load-media-error-handling': 'ignore',
-            'no-stop-slow-scripts': None,
-            'quiet': '',
-            'javascript-delay': 1500,
-            'margin-top': '40mm',      # leave room for header
-            'margin-bottom': '30mm',   # leave room for footer
-            'margin-left': '15mm',
-            'margin-right': '15mm',
-            # pass a realistic User-Agent so servers don't block wkhtmltopdf
-            'custom-header': [('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)')],
-            'custom-header-propagation': None,
-        }
-
-        # Create a temporary pdf file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_pdf:
-            tmp_pdf_path = tmp_pdf.name
-
-        # Try creating PDF from string first; fallback to write-file + from_file() if that fails
-        try:
-            pdfkit.from_string(enriched_html, tmp_pdf_path, configuration=config, options=options)
-        except OSError as e:
-            # fallback to writing an intermediate HTML file with a <base href="..."> so relative URLs resolve
-            print("[US-F003] pdfkit.from_string failed — trying fallback write-to-file + from_file().")
-            print("[US-F003] Original error:", str(e))
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".html", mode="w", encoding="utf-8") as tmp_html:
-                base_tag = f'<base href="{blog_url}">'
-                content = enriched_html
-                if re.search(r'<head[^>]*>', content, flags=re.IGNORECASE):
-                    content = re.sub(r'(<head[^>]*>)', r'\1' + base_tag, content, count=1, flags=re.IGNORECASE)
-                else:
-                    # ensure a head exists
-                    content = content.replace('<html>', f'<html><head>{base_tag}</head>', 1)
-                tmp_html.write(content)
-                tmp_html_path = tmp_html.name
+        # Always anchor relative URLs to the blog — we hand wkhtmltopdf
+        # the body we already downloaded, so it must not re-fetch the
+        # document to resolve them (previously only done on the fallback)
+        enriched_html = _inject_base_tag(enriched_html, blog_url)
 
-            try:
-                pdfkit.from_file(tmp_html_path, tmp_pdf_path, configuration=config, options=options)
-            finally:
-                # remove the temporary HTML file (we keep the PDF to serve)
-                try:
-                    os.remove(tmp_html_path)
-                except Exception:
-                    pass
-
-        print(f"[US-F003] Successfully generated PDF for: {blog_url} -> {tmp_pdf_path}")
-
-        # send_file will stream the PDF to the client
-        return send_file(tmp_pdf_path, as_attachment=True, download_name="blog.pdf")
+        # shallow copy of the shared options; only the JS keys vary below
+        options = WKHTML_OPTIONS.copy()
+
+        # The old fixed 'javascript-delay': 1500 made every render wait
+        # 1.5s even for static HTML. Only pay it when the client asks for
+        # JS ({"js": true}) or the page actually carries <script> tags;
+        # static pages render with JS off and no delay.
+        if data.get("js") or "<script" in html.lower():
+            options['javascript-delay'] = 1500
+        else:
+            options['javascript-delay'] = 0
+            options['disable-javascript'] = None
+
+        # Render on the bounded pool: most of the wall time is spent
+        # waiting on the wkhtmltopdf child process (GIL released), so
+        # concurrent requests get real parallelism, capped at core count.
+        # Very long pages are tiled and merged instead of rendered whole.
+        if len(enriched_html) > _TILE_THRESHOLD:
+            pdf_bytes = _render_tiled(enriched_html, blog_url, options)
+        else:
+            pdf_bytes = RENDER_POOL.submit(_render_pdf, enriched_html, blog_url, options).result()
+
+        with PDF_CACHE_LOCK:
+            PDF_CACHE[cache_key] = pdf_bytes
+        print(f"[US-F003] Successfully generated PDF for: {blog_url} ({len(pdf_bytes)} bytes)")
+
+        # send_file streams the in-memory buffer to the client
+        return send_file(io.BytesIO(pdf_bytes), mimetype='application/pdf',
+                         as_attachment=True, download_name="blog.pdf")
     except Exception as e:
         print(f"[US-F003] Unexpected error in /convert: {str(e)}")
         return jsonify({"error": "Internal server error during conversion."}), 500
 
 
 if __name__ == '__main__':
-    app.run(debug=True, port=3000, host='127.0.0.1')
+    # threaded=True so concurrent /convert requests actually reach the
+    # render pool instead of serializing in the dev server
+    app.run(debug=True, port=3000, host='127.0.0.1', threaded=True)
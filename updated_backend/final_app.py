@@ -1,18 +1,36 @@
-from flask import Flask, request, send_file, jsonify, send_from_directory
+from flask import Flask, Response, request, send_file, jsonify, send_from_directory
 from flask_cors import CORS
+import base64
+import hashlib
+import io
+import logging
+import logging.handlers
 import pdfkit
+import queue
+import shutil
+import subprocess
 import tempfile
+import threading
+import time
 import os
 import requests
+from cachetools import TTLCache
+import ipaddress
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 from pathlib import Path
 
-from remove_ads import remove_ads_from_html
+import lxml.html as lxml_html
+
+from remove_ads import remove_ads_from_tree
 from platform_cleanup import clean_platform_specific   # <-- NEW (US-F002)
 
 # metadata + injector
-from metadata import extract_metadata
-from metadata_injector import inject_metadata_into_html
+from metadata import extract_metadata, inject_metadata_into_html
 
 # ------------------ Paths ------------------
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -20,13 +38,380 @@ FRONTEND_DIR = os.path.join(os.path.dirname(BASE_DIR), 'frontend')
 STATIC_DIR = os.path.join(BASE_DIR, 'static')
 CSS_FILE = os.path.join(STATIC_DIR, 'pdf-style.css')
 
+# Temp files land in a dedicated tmpfs directory when the platform has
+# one: RAM-backed writes skip the disk entirely and evaporate on reboot.
+# Only the pdfkit fallback below still touches a temp file (the streaming
+# path pipes HTML over stdin), and it unlinks after itself — the prune
+# thread is belt-and-braces against crashed requests pinning files.
+_TMPFS_ROOT = "/dev/shm"
+if os.path.isdir(_TMPFS_ROOT):
+    TMPDIR = os.path.join(_TMPFS_ROOT, "pdfsvc")
+else:
+    TMPDIR = os.path.join(tempfile.gettempdir(), "pdfsvc")
+os.makedirs(TMPDIR, exist_ok=True)
+
+_TMP_MAX_AGE = 300  # seconds
+
+
+def _prune_tmpdir():
+    while True:
+        time.sleep(_TMP_MAX_AGE)
+        cutoff = time.time() - _TMP_MAX_AGE
+        try:
+            with os.scandir(TMPDIR) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file() and entry.stat().st_mtime < cutoff:
+                            os.unlink(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+
+threading.Thread(target=_prune_tmpdir, daemon=True).start()
+
+# Request threads used to print() several times per conversion, and
+# print blocks on the stdout flush — under load that serializes workers
+# on terminal I/O. Records now go to an in-memory queue; a background
+# listener thread does the formatting and writing. LOGLEVEL=WARNING in
+# production skips the formatting cost of the per-request chatter too.
+_LOG_QUEUE = queue.SimpleQueue()
+_LOG_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, logging.StreamHandler())
+_LOG_LISTENER.start()
+
+logger = logging.getLogger("convert")
+logger.setLevel(os.environ.get("LOGLEVEL", "INFO"))
+logger.addHandler(logging.handlers.QueueHandler(_LOG_QUEUE))
+logger.propagate = False
+
 app = Flask(__name__)
 CORS(app)
 
+# Behind nginx, let it do zero-copy delivery of file-backed responses
+# (the frontend assets served below): Flask only emits an X-Sendfile
+# header and nginx streams the file via sendfile(2). Opt-in because the
+# header is meaningless — and the response empty — without a proxy
+# configured to honour it. PDFs stream from memory and are unaffected.
+if os.environ.get("BEHIND_NGINX"):
+    app.use_x_sendfile = True
+
+# Optional: orjson (Rust) replaces Flask's pure-Python JSON for both
+# request parsing and jsonify responses. Small payloads here, but it's
+# free CPU back on every call; no-op when the package is absent.
+try:
+    import orjson
+    from flask.json.provider import JSONProvider
+
+    class _OrjsonProvider(JSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = _OrjsonProvider(app)
+except ImportError:
+    pass
+
 # wkhtmltopdf config
 path_to_wkhtmltopdf = r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe"
 config = pdfkit.configuration(wkhtmltopdf=path_to_wkhtmltopdf) if os.path.exists(path_to_wkhtmltopdf) else None
 
+# Resolved binary for the streaming render path below; pdfkit (and its
+# temp-file handling) is only the fallback when we can't find it.
+WKHTMLTOPDF_BIN = (shutil.which("wkhtmltopdf")
+                   or (path_to_wkhtmltopdf if os.path.exists(path_to_wkhtmltopdf) else None))
+
+
+def _options_to_argv(options):
+    """Translate a pdfkit options dict into wkhtmltopdf CLI arguments."""
+    argv = []
+    for key, value in options.items():
+        if key == 'custom-header':
+            for name, val in value:
+                argv += ['--custom-header', name, val]
+            continue
+        if value is None or value == '':
+            argv.append(f'--{key}')
+        else:
+            argv += [f'--{key}', str(value)]
+    return argv
+
+
+# wkhtmltopdf options — constant per process, so the dict (and its CLI
+# translation below) is built once at import instead of per request
+WKHTML_OPTIONS = {
+    'enable-local-file-access': None,
+    'load-error-handling': 'ignore',
+    'load-media-error-handling': 'ignore',
+    'no-stop-slow-scripts': None,
+    'quiet': '',
+
+    # Margins (header/footer space)
+    'margin-top': '40mm',
+    'margin-bottom': '30mm',
+    'margin-left': '20mm',
+    'margin-right': '20mm',
+
+    # PDF Layout (US-F007)
+    'page-size': 'A4',
+    'encoding': 'UTF-8',
+    'minimum-font-size': 12,
+    'image-quality': 95,
+    # 150 dpi halves raster size vs 300 with no visible loss on screens
+    # (PDFs are overwhelmingly viewed at ~96 dpi, not printed)
+    'image-dpi': 150,
+
+    'enable-javascript': None,
+    'print-media-type': None,
+    'custom-header': [('User-Agent', 'Mozilla/5.0')],
+    'custom-header-propagation': None,
+}
+
+# Pre-translated CLI form of the default options; per-request variants
+# (identity check below) fall back to translating their own dict.
+_STATIC_ARGV = _options_to_argv(WKHTML_OPTIONS)
+
+
+def _argv_for(options):
+    if options is WKHTML_OPTIONS:
+        return _STATIC_ARGV
+    return _options_to_argv(options)
+
+
+# Cap concurrent wkhtmltopdf children at core count: each child can
+# spike a full core, so unbounded spawns under load thrash the box and
+# blow up tail latency. Excess requests queue on the semaphore.
+_RENDER_GATE = threading.BoundedSemaphore(os.cpu_count() or 2)
+
+# One ceiling for both render paths: a page that never settles (e.g.
+# window.status is never set) must not hold a gate slot forever.
+_RENDER_TIMEOUT = 60
+
+
+def _render_pdf_bytes(enriched_html, options):
+    """Render HTML to PDF bytes via wkhtmltopdf stdin/stdout.
+
+    Piping '-' to '-' avoids the temp-HTML write, the temp-PDF write and
+    the read-back that pdfkit's file-based API costs on every request.
+    Falls back to pdfkit when the binary couldn't be located (pdfkit may
+    still find it through its own configuration).
+    """
+    if WKHTMLTOPDF_BIN is None:
+        with _RENDER_GATE:
+            return pdfkit.from_string(enriched_html, False, configuration=config, options=options)
+    argv = [WKHTMLTOPDF_BIN] + _argv_for(options) + ['-', '-']
+    with _RENDER_GATE:
+        proc = subprocess.run(argv, input=enriched_html.encode('utf-8'),
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                              timeout=_RENDER_TIMEOUT)
+    if proc.returncode != 0 or not proc.stdout:
+        raise OSError(proc.stderr.decode('utf-8', 'replace').strip()[-500:])
+    return proc.stdout
+
+# Shared HTTP session: connections to repeat hosts stay pooled so the
+# TCP+TLS handshake is paid once per host, not once per request, with a
+# couple of cheap retries on transient upstream errors.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64,
+                       max_retries=Retry(total=2, backoff_factor=0.2,
+                                         status_forcelist=[502, 503, 504]))
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+# Ask origins for compressed bodies — most blog CDNs serve gzip/brotli
+# when offered, cutting wire bytes several-fold; requests decompresses
+# transparently (brotli via the brotli package).
+SESSION.headers.update({
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Accept": "text/html,application/xhtml+xml",
+})
+
+# Fetched + cleaned HTML (and its metadata) per URL: a repeat request
+# within the TTL skips the origin fetch, ad removal, platform cleanup
+# and metadata extraction entirely. The lock is needed because TTLCache
+# mutates internal state on reads. Clients can send "force_refresh" to
+# bypass a stale entry.
+_CLEAN_CACHE = TTLCache(maxsize=256, ttl=600)
+_CLEAN_CACHE_LOCK = threading.Lock()
+# Entries hold post-inlining HTML, where data: URIs can balloon a page
+# far past the fetch cap — skip oversized ones rather than let 256 of
+# them pin hundreds of MB (same policy as remove_ads' clean cache).
+_CLEAN_CACHE_MAX_ENTRY = 4 * 1024 * 1024
+
+# Refuse to slurp arbitrary payloads: a URL pointing at a video or ISO
+# would otherwise be downloaded wholesale into resp.text.
+MAX_HTML_BYTES = 10 * 1024 * 1024
+
+
+def _canonical_url(blog_url):
+    """Lowercase the scheme/host and trim whitespace so trivially
+    different spellings of the same URL share one cache entry."""
+    parts = urlsplit(blog_url.strip())
+    return parts._replace(scheme=parts.scheme.lower(),
+                          netloc=parts.netloc.lower()).geturl()
+
+
+def _validate_url(blog_url):
+    """Return an error message for invalid or unsafe URLs, else None.
+
+    Malformed URLs fail here for free instead of paying the connect
+    timeout, and hosts resolving to private/loopback ranges are refused
+    so the service can't be used to probe the internal network (SSRF).
+    Unresolvable hosts are left for the fetch to report as before.
+    """
+    parts = urlsplit(blog_url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return "Invalid URL: must be an absolute http(s) URL."
+    try:
+        infos = socket.getaddrinfo(parts.hostname, None)
+    except (socket.gaierror, UnicodeError):
+        return None
+    for info in infos:
+        ip = ipaddress.ip_address(info[4][0])
+        if ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved:
+            return "Refusing to fetch private or internal addresses."
+    return None
+
+# Rendered-PDF cache keyed by a normalized digest of the cleaned HTML:
+# the same article reached through different URLs, or a page whose only
+# changes are counters/timestamps, collapses to one wkhtmltopdf run —
+# the heaviest stage of the pipeline by far.
+_PDF_CACHE = TTLCache(maxsize=64, ttl=600)
+_PDF_CACHE_LOCK = threading.Lock()
+
+# Normalization drops tag attributes and digit runs so view counts,
+# timestamps and per-session tracking attributes don't defeat the dedupe.
+_TAG_ATTRS_RE = re.compile(r'<([a-zA-Z][a-zA-Z0-9]*)[^>]*>')
+_DIGIT_RUN_RE = re.compile(r'\d+')
+
+# The custom CSS is static for the process lifetime in practice; cache
+# it keyed on the file's mtime so each request costs one stat() instead
+# of an exists-check plus a full read, while edits still show up in dev.
+_CSS_CACHE = {"mtime": None, "css": ""}
+
+
+def _load_custom_css():
+    """Return the <style>-wrapped custom CSS, re-reading only on change."""
+    try:
+        mtime = os.stat(CSS_FILE).st_mtime
+    except OSError:
+        _CSS_CACHE.update(mtime=None, css="")
+        return ""
+    if mtime != _CSS_CACHE["mtime"]:
+        with open(CSS_FILE, 'r', encoding='utf-8') as f:
+            _CSS_CACHE.update(mtime=mtime, css=f"<style>{f.read()}</style>")
+    return _CSS_CACHE["css"]
+
+
+# Compiled once for the fallback path; subn's count doubles as the
+# "was there a <head>?" check so the document is scanned a single time.
+_HEAD_RE = re.compile(r'(<head[^>]*>)', re.IGNORECASE)
+
+
+def _content_digest(html):
+    """Fingerprint of the cleaned HTML, insensitive to attribute/digit noise."""
+    normalized = _TAG_ATTRS_RE.sub(r'<\1>', html)
+    normalized = _DIGIT_RUN_RE.sub('', normalized)
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+
+# wkhtmltopdf fetches each remote <img> serially through its own Qt
+# network stack, with none of our session's pooling. Pre-fetching the
+# images concurrently and inlining them as data: URIs leaves the child
+# zero network I/O — the dominant render latency on image-heavy blogs.
+_IMAGE_POOL = ThreadPoolExecutor(max_workers=16)
+_MAX_INLINE_IMAGE = 2 * 1024 * 1024  # don't balloon the HTML with huge files
+
+
+def _fetch_image_data_uri(url):
+    # Same SSRF gate as the page fetch: image srcs are attacker-controlled
+    # too, and inlining would embed whatever a private address returns.
+    if _validate_url(url) is not None:
+        return None
+    try:
+        r = SESSION.get(url, timeout=10)
+        r.raise_for_status()
+    except requests.exceptions.RequestException:
+        return None
+    ctype = r.headers.get("Content-Type", "").split(";")[0].strip()
+    if not ctype.startswith("image/") or len(r.content) > _MAX_INLINE_IMAGE:
+        return None
+    return f"data:{ctype};base64,{base64.b64encode(r.content).decode()}"
+
+
+def _inline_images(tree, blog_url):
+    """Rewrite <img src> to data: URIs, fetched concurrently in-session.
+
+    Failures (dead links, non-images, oversized files) leave the original
+    src in place for wkhtmltopdf to try itself.
+    """
+    targets = {}
+    for el in tree.iter('img'):
+        src = el.get('src')
+        if not src or src.startswith('data:'):
+            continue
+        targets.setdefault(urljoin(blog_url, src), []).append(el)
+    if not targets:
+        return
+    urls = list(targets)
+    for url, data_uri in zip(urls, _IMAGE_POOL.map(_fetch_image_data_uri, urls)):
+        if data_uri:
+            for el in targets[url]:
+                el.set('src', data_uri)
+
+
+def _stream_render(enriched_html, options, digest):
+    """Yield PDF chunks straight from wkhtmltopdf stdout.
+
+    Peak memory for the response stays at O(chunk) no matter how large
+    the PDF is; the chunks are also collected so a complete, successful
+    render still lands in the digest cache at EOF. A writer thread feeds
+    stdin so the child never deadlocks on full pipes.
+    """
+    argv = [WKHTMLTOPDF_BIN] + _argv_for(options) + ['-', '-']
+    with _RENDER_GATE:
+        proc = subprocess.Popen(argv, stdin=subprocess.PIPE,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+        # Popen has no timeout= like subprocess.run; without a watchdog a
+        # page that never reaches --window-status ready would block the
+        # stdout read below and pin its gate slot forever. Killing the
+        # child EOFs the pipe, so the loop exits and returncode is
+        # non-zero — the truncated output never reaches the cache.
+        watchdog = threading.Timer(_RENDER_TIMEOUT, proc.kill)
+        watchdog.daemon = True
+        watchdog.start()
+
+        def _feed():
+            try:
+                proc.stdin.write(enriched_html.encode('utf-8'))
+                proc.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+
+        writer = threading.Thread(target=_feed, daemon=True)
+        writer.start()
+        collected = []
+        try:
+            while True:
+                chunk = proc.stdout.read(1 << 20)
+                if not chunk:
+                    break
+                collected.append(chunk)
+                yield chunk
+            writer.join()
+            returncode = proc.wait()
+        finally:
+            watchdog.cancel()
+            if proc.poll() is None:
+                proc.kill()  # client went away mid-stream
+
+    if returncode == 0 and collected:
+        with _PDF_CACHE_LOCK:
+            _PDF_CACHE[digest] = b"".join(collected)
+
+
 # ------------------ Routing ------------------
 
 @app.route('/')
@@ -48,106 +433,188 @@ def convert_blog_to_pdf():
         if not blog_url:
             return jsonify({"error": "No URL provided"}), 400
 
-        # Fetch HTML
-        try:
-            print(f"[US-F003] Fetching content from: {blog_url}")
-            resp = requests.get(blog_url, timeout=15,
-                                headers={"User-Agent": "Mozilla/5.0"})
-            resp.raise_for_status()
-        except requests.exceptions.Timeout:
-            return jsonify({"error": "Request timed out while loading the blog."}), 504
-        except requests.exceptions.RequestException as e:
-            return jsonify({"error": f"Failed to fetch blog: {e}"}), 400
-
-        html = resp.text
-
-        # 1) Remove ads (conservative cleanup)
-        try:
-            html = remove_ads_from_html(html, source_url=blog_url)
-        except Exception as e:
-            print("[US-F003] remove_ads_from_html failed:", str(e))
+        error = _validate_url(blog_url)
+        if error:
+            return jsonify({"error": error}), 400
+        blog_url = _canonical_url(blog_url)
 
-        # 2) US-F002 platform-specific cleanup (Medium, WP, Blogger, Substack)
-        try:
-            html = clean_platform_specific(html, blog_url)
-        except Exception as e:
-            print("[US-F002] Platform cleanup failed:", str(e))
+        # Cached fetch+clean pipeline: repeat requests for the same URL
+        # within the TTL skip the network and both cleanup passes.
+        cached = None
+        if not data.get("force_refresh"):
+            with _CLEAN_CACHE_LOCK:
+                cached = _CLEAN_CACHE.get(blog_url)
+
+        if cached is not None:
+            logger.info("[US-F003] Using cached content for: %s", blog_url)
+            html, metadata = cached
+        else:
+            # Fetch HTML
+            try:
+                logger.info("[US-F003] Fetching content from: %s", blog_url)
+                # (connect, read) timeouts: fail fast on dead hosts, allow
+                # slow bodies the same 15s as before. stream=True lets us
+                # reject non-HTML and oversized bodies from the headers /
+                # first chunks instead of downloading them wholesale.
+                resp = SESSION.get(blog_url, timeout=(5, 15), stream=True)
+                resp.raise_for_status()
+
+                ctype = resp.headers.get("Content-Type", "")
+                if ctype and "text/html" not in ctype and "application/xhtml" not in ctype:
+                    resp.close()
+                    return jsonify({"error": f"URL does not serve an HTML page ({ctype.split(';')[0]})."}), 415
+
+                chunks, total = [], 0
+                for chunk in resp.iter_content(65536):
+                    total += len(chunk)
+                    if total > MAX_HTML_BYTES:
+                        resp.close()
+                        return jsonify({"error": "Page is too large to convert."}), 413
+                    chunks.append(chunk)
+            except requests.exceptions.Timeout:
+                return jsonify({"error": "Request timed out while loading the blog."}), 504
+            except requests.exceptions.RequestException as e:
+                return jsonify({"error": f"Failed to fetch blog: {e}"}), 400
 
-        # 3) Metadata extraction
-        metadata = extract_metadata(html, source_url=blog_url)
-        print("[US-F005] Extracted metadata:", metadata)
+            # 1-3) One lxml parse shared by every stage: ad removal and
+            # platform cleanup mutate the tree, metadata extraction reads
+            # it, and the HTML is serialized exactly once afterwards.
+            # An explicit charset in the Content-Type header wins (libxml2
+            # never sees HTTP headers); otherwise hand over the raw bytes
+            # so libxml2 sniffs the BOM/meta charset itself and the str
+            # decode pass is skipped entirely.
+            body = b"".join(chunks)
+            charset = None
+            if "charset=" in ctype:
+                charset = ctype.rsplit("charset=", 1)[1].split(";")[0].strip().strip('"\'')
+            if charset:
+                tree = lxml_html.fromstring(body.decode(charset, errors="replace"))
+            else:
+                tree = lxml_html.fromstring(body)
 
-        # 4) Load custom styling (US-F007)
-        custom_css = ""
-        if os.path.exists(CSS_FILE):
-            with open(CSS_FILE, 'r', encoding='utf-8') as f:
-                custom_css = f"<style>{f.read()}</style>"
+            try:
+                remove_ads_from_tree(tree)
+            except Exception as e:
+                logger.warning("[US-F003] remove_ads_from_tree failed: %s", e)
+
+            # US-F002 platform-specific cleanup (Medium, WP, Blogger, Substack)
+            try:
+                clean_platform_specific(tree, blog_url)
+            except Exception as e:
+                logger.warning("[US-F002] Platform cleanup failed: %s", e)
+
+            # Metadata extraction
+            metadata = extract_metadata(tree, source_url=blog_url)
+            logger.info("[US-F005] Extracted metadata: %s", metadata)
+
+            # Pre-inline images so the renderer does no network I/O
+            try:
+                _inline_images(tree, blog_url)
+            except Exception as e:
+                logger.warning("[US-F003] Image inlining failed: %s", e)
+
+            html = lxml_html.tostring(tree, encoding="unicode")
+
+            if len(html) <= _CLEAN_CACHE_MAX_ENTRY:
+                with _CLEAN_CACHE_LOCK:
+                    _CLEAN_CACHE[blog_url] = (html, metadata)
+
+        # Collapse duplicate content before the render: the same article
+        # reached under another URL (or with only counters changed) is a
+        # digest hit and reuses the rendered bytes outright.
+        digest = _content_digest(html)
+        if not data.get("force_refresh"):
+            with _PDF_CACHE_LOCK:
+                cached_pdf = _PDF_CACHE.get(digest)
+            if cached_pdf is not None:
+                logger.info("[US-F003] Serving digest-matched PDF for: %s", blog_url)
+                return send_file(io.BytesIO(cached_pdf), mimetype='application/pdf',
+                                 as_attachment=True, download_name="blog.pdf")
+
+        # 4) Load custom styling (US-F007) — cached, re-read on change
+        custom_css = _load_custom_css()
 
         # 5) Inject header/footer + CSS
         enriched_html = inject_metadata_into_html(html, metadata, css=custom_css)
 
-        # wkhtmltopdf options
-        options = {
-            'enable-local-file-access': None,
-            'load-error-handling': 'ignore',
-            'load-media-error-handling': 'ignore',
-            'no-stop-slow-scripts': None,
-            'quiet': '',
-            'javascript-delay': 1500,
-
-            # Margins (header/footer space)
-            'margin-top': '40mm',
-            'margin-bottom': '30mm',
-            'margin-left': '20mm',
-            'margin-right': '20mm',
-
-            # PDF Layout (US-F007)
-            'page-size': 'A4',
-            'encoding': 'UTF-8',
-            'minimum-font-size': 12,
-            'image-quality': 95,
-            'image-dpi': 300,
-
-            'enable-javascript': None,
-            'print-media-type': None,
-            'custom-header': [('User-Agent', 'Mozilla/5.0')],
-            'custom-header-propagation': None,
-        }
-
-        # Create temp output file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_pdf:
-            tmp_pdf_path = tmp_pdf.name
-
-        # Direct PDF generation
+        # wkhtmltopdf options. The old fixed 'javascript-delay': 1500
+        # made every render wait 1.5s flat. Script-free pages now render
+        # with JS off and zero delay; pages with scripts get a readiness
+        # marker appended at the end of <body> and --window-status, so
+        # wkhtmltopdf returns as soon as the document signals ready
+        # instead of sleeping a fixed interval.
+        if "<script" in html.lower():
+            options = dict(WKHTML_OPTIONS)
+            options['window-status'] = 'ready'
+            ready_marker = "<script>window.status='ready';</script>"
+            if '</body>' in enriched_html:
+                enriched_html = enriched_html.replace('</body>', ready_marker + '</body>', 1)
+            else:
+                enriched_html += ready_marker
+        else:
+            options = dict(WKHTML_OPTIONS)
+            options.pop('enable-javascript', None)
+            options['disable-javascript'] = None
+
+        # Stream the PDF straight to the client when the binary is under
+        # our control. The first chunk is pulled eagerly so an immediate
+        # render failure still reaches the buffered path below (and its
+        # pdfkit fallback) with proper error handling; only a mid-stream
+        # failure truncates the chunked response.
+        if WKHTMLTOPDF_BIN is not None:
+            stream = _stream_render(enriched_html, options, digest)
+            first = next(stream, None)
+            if first is not None:
+                logger.info("[US-F003] Streaming PDF for: %s", blog_url)
+
+                def _body(first=first, stream=stream):
+                    yield first
+                    yield from stream
+
+                return Response(_body(), mimetype='application/pdf',
+                                headers={'Content-Disposition': 'attachment; filename=blog.pdf'})
+            logger.warning("[US-F003] Streaming render produced no output, using buffered path")
+
+        # Direct PDF generation — streamed through wkhtmltopdf, no temp PDF
         try:
-            pdfkit.from_string(enriched_html, tmp_pdf_path, configuration=config, options=options)
+            pdf_bytes = _render_pdf_bytes(enriched_html, options)
         except OSError as e:
-            print("[US-F003] from_string failed, fallback to file:", str(e))
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".html", mode="w", encoding="utf-8") as tmp_html:
-                base_tag = f'<base href="{blog_url}">'
-                content = enriched_html
-                if re.search(r'<head[^>]*>', content, flags=re.IGNORECASE):
-                    content = re.sub(r'(<head[^>]*>)', r'\1' + base_tag, content, count=1, flags=re.IGNORECASE)
-                else:
-                    content = content.replace('<html>', f'<html><head>{base_tag}</head>', 1)
-                tmp_html.write(content)
-                tmp_html_path = tmp_html.name
+            logger.warning("[US-F003] Streaming render failed, fallback to file: %s", e)
+            base_tag = f'<base href="{blog_url}">'
+            content, n = _HEAD_RE.subn(r'\1' + base_tag, enriched_html, count=1)
+            if not n:
+                content = content.replace('<html>', f'<html><head>{base_tag}</head>', 1)
+            # encode once and write the bytes in one go — a text-mode
+            # tempfile would re-encode chunk by chunk through TextIOWrapper
+            fd, tmp_html_path = tempfile.mkstemp(suffix=".html", dir=TMPDIR)
+            try:
+                os.write(fd, content.encode("utf-8"))
+            finally:
+                os.close(fd)
 
             try:
-                pdfkit.from_file(tmp_html_path, tmp_pdf_path, configuration=config, options=options)
+                pdf_bytes = pdfkit.from_file(tmp_html_path, False, configuration=config, options=options)
             finally:
                 try:
                     os.remove(tmp_html_path)
                 except Exception:
                     pass
 
-        print(f"[US-F003] Successfully generated PDF: {tmp_pdf_path}")
-        return send_file(tmp_pdf_path, as_attachment=True, download_name="blog.pdf")
+        with _PDF_CACHE_LOCK:
+            _PDF_CACHE[digest] = pdf_bytes
+
+        logger.info("[US-F003] Successfully generated PDF (%d bytes)", len(pdf_bytes))
+        return send_file(io.BytesIO(pdf_bytes), mimetype='application/pdf',
+                         as_attachment=True, download_name="blog.pdf")
 
     except Exception as e:
-        print("[ERROR] Unexpected:", str(e))
+        logger.exception("[ERROR] Unexpected error in /convert")
         return jsonify({"error": "Internal server error"}), 500
 
 
 if __name__ == '__main__':
-    app.run(debug=True, port=3000, host='127.0.0.1')
+    # threaded=True: each in-flight /convert spends nearly all its time
+    # blocked on the network fetch or the wkhtmltopdf child (GIL
+    # released), so worker threads give real concurrency under load
+    # instead of serializing requests in the dev server.
+    app.run(debug=True, port=3000, host='127.0.0.1', threaded=True)